@@ -971,21 +971,38 @@ def displayWindowsUnderMouse(xOffset: int = 0, yOffset: int = 0) -> None:
     if xOffset != 0 or yOffset != 0:
         print('xOffset: %s yOffset: %s' % (xOffset, yOffset))
     try:
-        prevWindows = None
+        prevHandles = None
+        prevPos = None
+        lastCheck = 0.0
+        positionTemplate = 'X: %4s Y: %4s  (Press Ctrl-C to quit)'
         while True:
             x, y = getMouse()
-            positionStr = 'X: ' + str(x - xOffset).rjust(4) + ' Y: ' + str(y - yOffset).rjust(4) + '  (Press Ctrl-C to quit)'
-            windows = getWindowsAt(x, y)
-            if windows != prevWindows:
-                print('\n')
-                prevWindows = windows
-                for win in windows:
-                    name = win.title
-                    eraser = '' if len(name) >= len(positionStr) else ' ' * (len(positionStr) - len(name))
-                    sys.stdout.write(name + eraser + '\n')
-            sys.stdout.write('\b' * len(positionStr))
-            sys.stdout.write(positionStr)
-            sys.stdout.flush()
+            positionStr = positionTemplate % (x - xOffset, y - yOffset)
+            positionLen = len(positionStr)
+            # Searching windows is by far the slowest part, so it is only done when the mouse moves
+            # (or once per second while it doesn't, in case windows under it changed)
+            now = time.monotonic()
+            redraw = (x, y) != prevPos
+            if redraw or now - lastCheck >= 1:
+                prevPos = (x, y)
+                lastCheck = now
+                windows = getWindowsAt(x, y)
+                # Handles are plain values which reliably identify each window (window objects may not, e.g. on macOS).
+                # Getting them is cheap on Windows and Linux, but on macOS it reads the title (one AppleScript per app,
+                # cached for a very short time, so titles printed below reuse it), on every search pass
+                handles = [win.getHandle() for win in windows]
+                if handles != prevHandles:
+                    print('\n')
+                    prevHandles = handles
+                    redraw = True
+                    for win in windows:
+                        name = win.title
+                        eraser = ' ' * (positionLen - len(name))
+                        sys.stdout.write(name + eraser + '\n')
+            # Nothing is written to the terminal if nothing changed, avoiding useless redraws
+            if redraw:
+                sys.stdout.write('\b' * positionLen + positionStr)
+                sys.stdout.flush()
             time.sleep(0.3)
     except KeyboardInterrupt:
         sys.stdout.write('\n\n')
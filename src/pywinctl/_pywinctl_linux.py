@@ -33,6 +33,19 @@ from pywinbox import Size, Point, Rect, pointInBox
 WAIT_ATTEMPTS = 10
 WAIT_DELAY = 0.025  # Will be progressively increased on every retry
 
+# Property data used by acceptInput(). These are shared, so they must never be modified in place (ewmhlib doesn't)
+# _NET_WM_WINDOW_OPACITY values: one byte (0xff * target_opacity) repeated in all four bytes of the CARDINAL
+_OPACITY_OPAQUE = [0xFFFFFFFF]
+_OPACITY_DESKTOP = [0xFAFAFAFA]
+# _MOTIF_WM_HINTS values. Cinnamon uses this as default: [2, 1, 1, 0, 0]
+_MOTIF_HINTS_DEFAULT = [2, 0, 0, 0, 0]
+_MOTIF_HINTS_NONE = [0, 0, 0, 0, 0]
+
+# Desktop environment, session type and platform will not change while running, so it is enough to check them once
+_IS_GNOME = "gnome" in os.environ.get('XDG_CURRENT_DESKTOP', "").lower()
+_IS_WAYLAND = os.environ.get('XDG_SESSION_TYPE', "").lower() == "wayland"
+_IS_ARM = "arm" in platform.platform()
+
 
 def checkPermissions(activate: bool = False) -> bool:
     """
@@ -71,7 +84,7 @@ def getActiveWindow() -> Optional[LinuxWindow]:
     # https://discourse.gnome.org/t/get-window-id-of-a-window-object-window-get-xwindow-doesnt-exist/10956/3
     # https://www.reddit.com/r/gnome/comments/d8x27b/is_there_a_program_that_can_show_keypresses_on/
     win_id: Union[str, int] = 0
-    if os.environ.get('XDG_SESSION_TYPE', '').lower() == "wayland":
+    if _IS_WAYLAND:
         # IN SWAY: swaymsg -t get_tree | jq '.. | select(.type?) | select(.focused==true).pid'
         # pynput / mouse --> Not working (no global events allowed, only application events)
         _, activeWindow = _WgetAllWindows()
@@ -112,7 +125,7 @@ def getAllWindows():
 
     :return: list of Window objects
     """
-    if os.environ.get('XDG_SESSION_TYPE', '').lower() == "wayland":
+    if _IS_WAYLAND:
         windowsList, _ = _WgetAllWindows()
         windows = [str(win["id"]) for win in windowsList]
     else:
@@ -257,7 +270,7 @@ def getAllAppsWindowsTitles():
     result: dict[str, List[str]] = {}
     for win in getAllWindows():
         appName = win.getAppName()
-        if appName in result.keys():
+        if appName in result:
             result[appName].append(win.title)
         else:
             result[appName] = [win.title]
@@ -303,7 +316,7 @@ def getAllWindowsDict(tryToFilter: bool = False) -> dict[str, _WINDICT]:
             "size": (size.width, size.height),
             "status": status
         }
-        if appName not in result.keys():
+        if appName not in result:
             result[appName] = {"pid": appPID, "windows": {}}
         result[appName]["windows"][win.title] = winDict
     return result
@@ -390,8 +403,6 @@ class LinuxWindow(BaseWindow):
         self._xWin: XWindow = self._win.xWindow
         self.watchdog = _WatchDog(self)
 
-        self._currDesktop = os.environ.get('XDG_CURRENT_DESKTOP', "").lower()
-        self._currSessionType = os.environ.get('XDG_SESSION_TYPE', "").lower()
         self._motifHints: List[int] = []
 
     def getExtraFrameSize(self, includeBorder: bool = True) -> Tuple[int, int, int, int]:
@@ -407,7 +418,7 @@ class LinuxWindow(BaseWindow):
         if includeBorder:
             geom = self._xWin.get_geometry()
             borderWidth = geom.border_width
-        if "gnome" in self._currDesktop:
+        if _IS_GNOME:
             _gtk_extents: List[int] = self._win._getGtkFrameExtents()
             if _gtk_extents and len(_gtk_extents) >= 4:
                 ret = (_gtk_extents[0] + borderWidth, _gtk_extents[2] + borderWidth,
@@ -546,7 +557,7 @@ class LinuxWindow(BaseWindow):
         :param user: ''True'' indicates a direct user request, as required by some WMs to comply.
         :return: ''True'' if window activated
         """
-        if "arm" in platform.platform():
+        if _IS_ARM:
             self._win.changeWmState(Props.StateAction.REMOVE, Props.State.ABOVE)
             self._win.changeWmState(Props.StateAction.ADD, Props.State.ABOVE, Props.State.FOCUSED)
         else:
@@ -582,6 +593,10 @@ class LinuxWindow(BaseWindow):
         :param wait: set to ''True'' to wait until action is confirmed (in a reasonable time lap)
         :return: ''True'' if window resized to the given size
         """
+        box = self.box
+        if box.width == newWidth and box.height == newHeight:
+            # Nothing to do. Reading the box is cheap, whilst resizing and waiting for it to complete is not
+            return True
         self.size = Size(newWidth, newHeight)
         box = self.box
         retries = 0
@@ -618,6 +633,10 @@ class LinuxWindow(BaseWindow):
         """
         newLeft = max(0, newLeft)  # Xlib won't accept negative positions
         newTop = max(0, newTop)
+        box = self.box
+        if box.left == newLeft and box.top == newTop:
+            # Nothing to do. Reading the box is cheap, whilst moving and waiting for it to complete is not
+            return True
         self.topleft = Point(newLeft, newTop)
         box = self.box
         retries = 0
@@ -697,7 +716,7 @@ class LinuxWindow(BaseWindow):
             for d in desktop:
                 w: XWindow = self._display.create_resource_object('window', d.id)
                 w.raise_window()
-                self._display.flush()
+            self._display.flush()
             types = self._win.getWmWindowType(True)
             return bool(types and Props.WindowType.DESKTOP in types)
 
@@ -716,13 +735,11 @@ class LinuxWindow(BaseWindow):
         # TODO: Is it possible to make the window completely transparent to input (click-thru) in GNOME?
         if setTo:
 
-            if "gnome" in self._currDesktop:
+            if _IS_GNOME:
 
                 self._win.changeWmState(Props.StateAction.REMOVE, Props.State.BELOW)
 
-                onebyte = int(0xFF)
-                fourbytes = onebyte | (onebyte << 8) | (onebyte << 16) | (onebyte << 24)
-                self._win.changeProperty("_NET_WM_WINDOW_OPACITY", [fourbytes], Xlib.Xatom.CARDINAL)
+                self._win.changeProperty("_NET_WM_WINDOW_OPACITY", _OPACITY_OPAQUE, Xlib.Xatom.CARDINAL)
 
                 if self._motifHints:
                     self._win.changeProperty("_MOTIF_WM_HINTS", self._motifHints)
@@ -731,18 +748,15 @@ class LinuxWindow(BaseWindow):
 
         else:
 
-            if "gnome" in self._currDesktop:
+            if _IS_GNOME:
 
                 self._win.changeWmState(Props.StateAction.ADD, Props.State.BELOW)
 
-                onebyte = int(0xFA)  # Calculate as 0xff * target_opacity
-                fourbytes = onebyte | (onebyte << 8) | (onebyte << 16) | (onebyte << 24)
-                self._win.changeProperty("_NET_WM_WINDOW_OPACITY", [fourbytes], Xlib.Xatom.CARDINAL)
+                self._win.changeProperty("_NET_WM_WINDOW_OPACITY", _OPACITY_DESKTOP, Xlib.Xatom.CARDINAL)
 
                 ret = self._win.getProperty("_MOTIF_WM_HINTS")
-                # Cinnamon uses this as default: [2, 1, 1, 0, 0]
-                self._motifHints = [a for a in ret.value] if ret and hasattr(ret, "value") else [2, 0, 0, 0, 0]
-                self._win.changeProperty("_MOTIF_WM_HINTS", [0, 0, 0, 0, 0])
+                self._motifHints = [a for a in ret.value] if ret and hasattr(ret, "value") else _MOTIF_HINTS_DEFAULT
+                self._win.changeProperty("_MOTIF_WM_HINTS", _MOTIF_HINTS_NONE)
 
             self._win.setWmWindowType(Props.WindowType.DESKTOP)
 
@@ -868,8 +882,11 @@ class LinuxWindow(BaseWindow):
 
         :return: ``True`` if the window is the active, foreground window
         """
-        win = getActiveWindow()
-        return bool(win and win.getHandle() == self._hWnd)
+        if _IS_WAYLAND:
+            win = getActiveWindow()
+            return bool(win and win.getHandle() == self._hWnd)
+        # No need to build a whole new Window object just to compare handles
+        return bool(self._rootWin.getActiveWindow() == self._hWnd)
 
     @property
     def title(self) -> str:
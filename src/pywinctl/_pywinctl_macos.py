@@ -8,28 +8,62 @@ import sys
 assert sys.platform == "darwin"
 
 import ast
+import atexit
 import difflib
+import os
 import platform
 import re
+import shutil
 import subprocess
+import tempfile
 import threading
 import time
-from collections.abc import Iterable
-from typing import Any, cast, Sequence, Dict, Optional, Union, List, Tuple
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, cast, Sequence, Dict, Optional, Set, Union, List, Tuple
 from typing_extensions import TypeAlias, TypedDict, Literal
 
 import AppKit
-import Quartz
 
 from ._main import BaseWindow, Re, _WatchDog, _findMonitorName, _WINDATA, _WINDICT
-from pywinbox import Size, Point, Rect, pointInBox
+from pywinbox import Box, Size, Point, Rect, pointInBox
 
 
 Incomplete: TypeAlias = Any
 Attribute: TypeAlias = Sequence['Tuple[str, str, bool, str]']
 
 WAIT_ATTEMPTS = 10
-WAIT_DELAY = 0.025  # Will be progressively increased on every retry
+WAIT_DELAY = 0.025  # Starting from a fraction of it, will be progressively increased on every retry
+
+_OSASCRIPT = "/usr/bin/osascript"
+_OSACOMPILE = "/usr/bin/osacompile"
+_MAX_WORKERS = 8  # Max number of osascript calls to run in parallel when they can't be grouped in just one
+
+# On Yosemite and below we need to use Zoom instead of FullScreen to maximize windows
+_MAC_VER = tuple(int(v) for v in platform.mac_ver()[0].split(".")[:2] if v.isdigit())
+_USE_ZOOM = bool(_MAC_VER) and _MAC_VER <= (10, 10)
+
+# Compiled version (.scpt file) of every constant AppleScript code used more than once, if it could be compiled
+# (None while it is being compiled). Code built at runtime (e.g. menu commands) is never cached, so these can't grow
+_compiledScripts: Dict[str, Optional[str]] = {}
+# Constant AppleScript code used only once so far
+_usedScripts: Set[str] = set()
+_compiledScriptsLock = threading.Lock()
+_compiledScriptsDir = ""
+# Number of compiled files so far, so file names are never reused, even if a compiled file is discarded
+_compiledScriptsCount = 0
+
+# Windows titles of every app (by PID), and when they were retrieved
+_APP_TITLES_TTL = 0.05
+_appTitles: Dict[int, Tuple[float, List[str]]] = {}
+
+# Minimized and maximized status of every window (by app PID and title), and when they were retrieved
+_WIN_STATES_TTL = 0.02
+_winStates: Dict[Tuple[int, str], Tuple[float, Tuple[bool, bool]]] = {}
+
+# Process name (as known by AppleScript) of every running app found so far. It is required by all AppleScript calls
+# Apps are identified by PID and launch time, since PIDs can be reused by new apps once the original app exits
+_procNames: Dict[Tuple[int, float], str] = {}
 
 
 def checkPermissions(activate: bool = False) -> bool:
@@ -59,8 +93,7 @@ def checkPermissions(activate: bool = False) -> bool:
                     set UI_enabled to UI elements enabled
                 end tell
                 return UI_enabled"""
-    proc = subprocess.Popen(['osascript'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-    ret, err = proc.communicate(cmd)
+    ret, err = _runAppleScript(cmd)
     ret = ret.replace("\n", "")
     return ret == "true"
 
@@ -88,8 +121,7 @@ def getActiveWindow() -> Optional[MacOSWindow]:
                 end try
                 return {appID, winName}
             end run"""
-    proc = subprocess.Popen(['osascript'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-    ret, err = proc.communicate(cmd)
+    ret, err = _runAppleScript(cmd)
     entries = ret.replace("\n", "").split(", ")
     appID = entries[0]
     # Thanks to Anthony Molinaro (djnym) for pointing out this bug and provide the solution!!!
@@ -146,14 +178,15 @@ def getAllTitles() -> List[str]:
 
     :return: list of titles as strings
     """
-    cmd = """osascript -s 's' -e 'tell application "System Events"
-                                set winNames to {}
-                                try
-                                    set winNames to {name of every window} of (every process whose background only is false)
-                                end try
-                            end tell
-                            return winNames'"""
-    ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8").replace("\n", "") \
+    cmd = """tell application "System Events"
+                set winNames to {}
+                try
+                    set winNames to {name of every window} of (every process whose background only is false)
+                end try
+            end tell
+            return winNames"""
+    ret, err = _runAppleScript(cmd, structured=True)
+    ret = ret.replace("\n", "") \
         .replace('missing value', '"missing value"') \
         .replace("{", "[").replace("}", "]")
     res = ast.literal_eval(ret)
@@ -225,14 +258,15 @@ def getAllAppsNames() -> List[str]:
 
     :return: list of names as strings
     """
-    cmd = """osascript -s 's' -e 'tell application "System Events"
-                                    set winNames to {}
-                                    try
-                                        set winNames to name of every process whose background only is false
-                                    end try
-                                end tell
-                                return winNames'"""
-    ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8").replace("\n", "") \
+    cmd = """tell application "System Events"
+                set winNames to {}
+                try
+                    set winNames to name of every process whose background only is false
+                end try
+            end tell
+            return winNames"""
+    ret, err = _runAppleScript(cmd, structured=True)
+    ret = ret.replace("\n", "") \
         .replace('missing value', '"missing value"') \
         .replace("{", "[").replace("}", "]")
     res = ast.literal_eval(ret)
@@ -293,15 +327,15 @@ def getAllAppsWindowsTitles():
 
     :return: python dictionary
     """
-    cmd = """osascript -s 's' -e 'tell application "System Events"
-                                    set winNames to {}
-                                    try
-                                        set winNames to {name, (name of every window)} of (every process whose background only is false)
-                                    end try
-                                end tell
-                                return winNames'"""
-    ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8") \
-        .replace('missing value', '"missing value"') \
+    cmd = """tell application "System Events"
+                set winNames to {}
+                try
+                    set winNames to {name, (name of every window)} of (every process whose background only is false)
+                end try
+            end tell
+            return winNames"""
+    ret, err = _runAppleScript(cmd, structured=True)
+    ret = ret.replace('missing value', '"missing value"') \
         .replace("\n", "").replace("{", "[").replace("}", "]")
     res: Tuple[List[str], List[List[str]]] = ast.literal_eval(ret)
     result: dict[str, List[str]] = {}
@@ -331,48 +365,32 @@ def getAllWindowsDict(tryToFilter: bool = False) -> dict[str, _WINDICT]:
     :param tryToFilter: Windows ONLY. Set to ''True'' to try to get User (non-system) apps only (may skip real user apps)
     :return: python dictionary
     """
-    windows = getAllWindows()
-    cmd = """osascript -s 's' -e 'tell application "System Events"
-                                    set winNames to {}
-                                    try
-                                        set winNames to {unix id, name, ({name, position, size} of every window)} of (every process whose background only is false)
-                                    end try
-                                end tell
-                                return winNames'"""
-    ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8").replace("\n", "") \
-        .replace('missing value', '"missing value"') \
-        .replace("{", "[").replace("}", "]")
-    res = ast.literal_eval(ret)
+    # Positions and sizes come from the same (single) AppleScript call used to enumerate windows, so there is
+    # no need to query every window again to find its display, nor to match windows by title afterwards
+    activeApps = {app.processIdentifier(): app for app in _getAllApps()}
     result: dict[str, _WINDICT] = {}
-    if len(res) > 0:
-        pids = res[0]
-        apps = res[1]
-        winsData = res[2]
-        for i, pID in enumerate(pids):
-            appName = apps[i]
-            titles = winsData[0][i]
-            pos = winsData[1][i]
-            sizes = winsData[2][i]
-            for j, title in enumerate(titles):
-                for win in windows:
-                    if title == win.title:
-                        winId = win.getHandle()
-                        status = 0
-                        if win.isMinimized:
-                            status = 1
-                        elif win.isMaximized:
-                            status = 2
-                        winDict: _WINDATA = {
-                            "id": winId,
-                            "display": win.getDisplay(),
-                            "position": pos[j],
-                            "size": sizes[j],
-                            "status": status
-                        }
-                        if appName not in result.keys():
-                            result[appName] = {"pid": pID, "windows": {}}
-                        result[appName]["windows"][title] = winDict
-                        break
+    for pID, title, pos, size in _getWindowTitles():
+        app = activeApps.get(pID, None)
+        if app is None:
+            continue
+        win = MacOSWindow(app, title)
+        appName = win.getAppName()
+        isMinimized, isMaximized = win._getMinMaxState()
+        status = 1 if isMinimized else 2 if isMaximized else 0
+        if isinstance(pos, list) and isinstance(size, list):
+            display = _findMonitorName(pos[0] + size[0] // 2, pos[1] + size[1] // 2)
+        else:
+            display = win.getDisplay()
+        winDict: _WINDATA = {
+            "id": (appName, title),
+            "display": display,
+            "position": pos,
+            "size": size,
+            "status": status
+        }
+        if appName not in result:
+            result[appName] = {"pid": pID, "windows": {}}
+        result[appName]["windows"][title] = winDict
     return result
 
 
@@ -385,12 +403,32 @@ def getWindowsAt(x: int, y: int, allWindows: Optional[List[MacOSWindow]] = None)
     :param allWindows: (optional) list of window objects (required to improve performance in Apple Script version)
     :return: list of Window objects
     """
-    windows = allWindows if allWindows else getAllWindows()
-    windowBoxGenerator = ((window, window.box) for window in windows)
-    return [
-        window for (window, box)
-        in windowBoxGenerator
-        if pointInBox(x, y, box)]
+    # Each entry holds the window and whether it contains the point (None if it has to be checked yet)
+    candidates: List[Tuple[MacOSWindow, Optional[bool]]] = []
+    if allWindows:
+        candidates = [(window, None) for window in allWindows]
+    else:
+        # Positions and sizes are retrieved in the same call used to enumerate windows, so only the windows
+        # which contain the point need to be built (plus those whose geometry couldn't be retrieved that way)
+        activeApps = {app.processIdentifier(): app for app in _getAllApps()}
+        for pID, title, pos, size in _getWindowTitles():
+            app = activeApps.get(pID, None)
+            if app is None:
+                continue
+            if isinstance(pos, list) and isinstance(size, list):
+                if pointInBox(x, y, Box(pos[0], pos[1], size[0], size[1])):
+                    candidates.append((MacOSWindow(app, title), True))
+            else:
+                candidates.append((MacOSWindow(app, title), None))
+    unknown = [window for window, inside in candidates if inside is None]
+    checked: List[bool] = []
+    if unknown:
+        # Every box query spawns its own osascript (it's done by PyWinBox, so they can't be batched). Overlapping
+        # them in a few threads makes total wait roughly as long as the slowest query, instead of the sum of all
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(unknown))) as executor:
+            checked = list(executor.map(lambda window: pointInBox(x, y, window.box), unknown))
+    results = iter(checked)
+    return [window for window, inside in candidates if inside or (inside is None and next(results))]
 
 
 def getTopWindowAt(x: int, y: int, allWindows: Optional[List[MacOSWindow]] = None) -> Optional[MacOSWindow]:
@@ -410,16 +448,115 @@ def getTopWindowAt(x: int, y: int, allWindows: Optional[List[MacOSWindow]] = Non
     return None if len(windows) == 0 else windows[-1]
 
 
+def _waitFor(condition: Callable[[], bool], wait: bool = True) -> bool:
+    # Checks condition and, if wait is True, keeps checking it until it is met or until the overall time which
+    # WAIT_ATTEMPTS progressive retries would take runs out. Delays start short and double on every retry (up to a
+    # limit), so changes which are quickly applied are detected sooner, without querying the window too often
+    met = condition()
+    if wait and not met:
+        deadline = time.monotonic() + WAIT_DELAY * WAIT_ATTEMPTS * (WAIT_ATTEMPTS + 1) / 2
+        delay = WAIT_DELAY / 5
+        while not met and time.monotonic() < deadline:
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, WAIT_DELAY * 4)
+            # Cached values are not valid while waiting for the window to change
+            _appTitles.clear()
+            _winStates.clear()
+            met = condition()
+    return met
+
+
+def _compileAppleScript(cmd: str) -> Optional[str]:
+    # Compiles the given AppleScript code into a temporary .scpt file, only once per process, so osascript
+    # doesn't need to parse and compile it again on every call. Returns None if it couldn't be compiled (or not yet)
+    # Code is compiled the second time it is used, since compiling one-time code would just add one more process
+    global _compiledScriptsDir, _compiledScriptsCount
+    with _compiledScriptsLock:
+        if cmd in _compiledScripts:
+            return _compiledScripts[cmd]
+        if cmd not in _usedScripts:
+            _usedScripts.add(cmd)
+            return None
+        _usedScripts.discard(cmd)
+        if not _compiledScriptsDir:
+            _compiledScriptsDir = tempfile.mkdtemp(prefix="pywinctl_")
+            atexit.register(shutil.rmtree, _compiledScriptsDir, True)
+        else:
+            # Temporary files may be removed by the system or by other apps
+            os.makedirs(_compiledScriptsDir, exist_ok=True)
+        path: Optional[str] = os.path.join(_compiledScriptsDir, "%s.scpt" % _compiledScriptsCount)
+        _compiledScriptsCount += 1
+        # Other threads will run the source code until it is compiled
+        _compiledScripts[cmd] = None
+    # Compiling outside the lock, so it doesn't block other threads
+    # osacompile reads the source from stdin if no input file is given
+    proc = subprocess.Popen([_OSACOMPILE, '-o', str(path)], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, close_fds=False, encoding='utf8')
+    proc.communicate(cmd)
+    if proc.returncode != 0:
+        path = None
+    with _compiledScriptsLock:
+        _compiledScripts[cmd] = path
+    return path
+
+
+def _discardCompiledAppleScript(cmd: str, script: str):
+    # Compiled file is not valid anymore. Code will be compiled again the next time it is used more than once
+    with _compiledScriptsLock:
+        if _compiledScripts.get(cmd, None) == script:
+            del _compiledScripts[cmd]
+
+
+def _runAppleScript(cmd: str, *args: str, structured: bool = False, cache: bool = True) -> Tuple[str, Optional[str]]:
+    # Runs the given AppleScript code, passing args to its "run" handler.
+    # Set cache to False if code is built at runtime (variable data should be passed as args whenever possible)
+    # All AppleScript calls go through here so the way osascript is invoked can be tuned in just one place.
+    # A persistent "osascript -i" session is not an option: it evaluates line by line, so it can't take
+    # multi-line "on run" handlers nor receive arguments, and it would have to be serialized among threads
+    # Don't use JavaScript for Automation (osascript -l JavaScript) either: it is several times slower to run
+    # than compiled AppleScript
+    # Using absolute path, no shell and close_fds=False lets subprocess use posix_spawn() instead of fork() + exec()
+    flags = ['-s', 's'] if structured else []
+    script = _compileAppleScript(cmd) if cache else None
+    if script:
+        proc = subprocess.Popen([_OSASCRIPT, *flags, script, *args],
+                                stdout=subprocess.PIPE, close_fds=False, encoding='utf8')
+        ret, err = proc.communicate()
+        if proc.returncode == 0 or os.path.exists(script):
+            return ret, err
+        # Compiled file has been removed, so running the source code instead
+        _discardCompiledAppleScript(cmd, script)
+    proc = subprocess.Popen([_OSASCRIPT, *flags, '-', *args],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, close_fds=False, encoding='utf8')
+    ret, err = proc.communicate(cmd)
+    return ret, err
+
+
+def _escapeAppleScript(text: str) -> str:
+    # Menu items can only be referenced within the script body. Escape them so quotes can't break the script
+    return str(text).replace("\\", "\\\\").replace('"', '\\"')
+
+
 def _getAllApps(userOnly: bool = True):
     matches: List[AppKit.NSRunningApplication] = []
     for app in AppKit.NSWorkspace.sharedWorkspace().runningApplications():
-        if not userOnly or (userOnly and app.activationPolicy() == Quartz.NSApplicationActivationPolicyRegular):
+        if not userOnly or (userOnly and app.activationPolicy() == AppKit.NSApplicationActivationPolicyRegular):
             matches.append(app)
     return matches
 
 
-def _getAppWindowsTitles(app: AppKit.NSRunningApplication):
-    pid: str = str(app.processIdentifier())
+def _getAppKey(app: AppKit.NSRunningApplication) -> Tuple[int, float]:
+    launchDate = app.launchDate()
+    return app.processIdentifier(), launchDate.timeIntervalSince1970() if launchDate is not None else 0.0
+
+
+def _getAppWindowsTitles(app: AppKit.NSRunningApplication, useCache: bool = True) -> List[str]:
+    # Titles are reused for a very short time, since several properties (title, visible, ...) may require them in a row
+    # Set useCache to False to make sure a title is not found in the current windows (e.g. a window may be just opened)
+    pid: int = app.processIdentifier()
+    cached = _appTitles.get(pid, None)
+    if useCache and cached is not None and time.monotonic() - cached[0] < _APP_TITLES_TTL:
+        return cached[1]
     cmd = """on run arg1
                 set pid to arg1 as integer
                 set winNames to {}
@@ -431,43 +568,46 @@ def _getAppWindowsTitles(app: AppKit.NSRunningApplication):
                 end try
                 return winNames
             end run"""
-    proc = subprocess.Popen(['osascript', '-s', 's', '-', pid],
-                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-    ret, err = proc.communicate(cmd)
+    ret, err = _runAppleScript(cmd, str(pid), structured=True)
     ret = ret.replace("\n", "").replace('missing value', '"missing value"').replace("{", "[").replace("}", "]")
-    res = ast.literal_eval(ret)
-    return res or []
+    res: List[str] = ast.literal_eval(ret) or []
+    _appTitles[pid] = (time.monotonic(), res)
+    return res
 
 
-def _getWindowTitles() -> List[List[str]]:
+def _getWindowTitles() -> List[List[Any]]:
     # https://gist.github.com/qur2/5729056 - qur2
-    cmd = """osascript -s 's' -e 'tell application "System Events"
-                                    set winNames to {}
-                                    try
-                                        set winNames to {unix id, ({name, position, size} of (every window))} of (every process whose background only is false)
-                                    end try
-                                end tell
-                                return winNames'"""
-    ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8").replace("\n", "") \
+    # Process names are retrieved in the same call, so new Window objects don't need to query them one by one
+    cmd = """tell application "System Events"
+                set winNames to {}
+                try
+                    set winNames to {unix id, name, ({name, position, size} of (every window))} of (every process whose background only is false)
+                end try
+            end tell
+            return winNames"""
+    ret, err = _runAppleScript(cmd, structured=True)
+    ret = ret.replace("\n", "") \
         .replace('missing value', '"missing value"') \
         .replace("{", "[").replace("}", "]")
     res = ast.literal_eval(ret)
-    result: List[List[str]] = []
-    if len(res) > 0:
-        for i, pID in enumerate(res[0]):
-            try:
-                item = res[1][0][i]
-                j = 0
-                for title in item:  # One-liner script is way faster, but produces complex data structures
-                    try:
-                        pos = res[1][1][i][j]
-                        size = res[1][2][i][j]
-                        result.append([pID, title, pos, size])
-                    except:
-                        pass
-                    j += 1
-            except:
-                pass
+    result: List[List[Any]] = []
+    # One-liner script is way faster, but produces complex data structures:
+    # [[pid, ...], [procName, ...], [[[title, ...], ...], [[pos, ...], ...], [[size, ...], ...]]]
+    if len(res) == 3 and len(res[2]) == 3:
+        appKeys = {app.processIdentifier(): _getAppKey(app) for app in _getAllApps(userOnly=False)}
+        procNames: Dict[Tuple[int, float], str] = {}
+        now = time.monotonic()
+        titles, positions, sizes = res[2]
+        for pID, procName, winTitles, winPos, winSizes in zip(res[0], res[1], titles, positions, sizes):
+            if procName and procName != "missing value" and pID in appKeys:
+                procNames[appKeys[pID]] = procName
+            # Refreshing cached titles too, so windows found here are also found by the Window objects built on them
+            _appTitles[pID] = (now, list(winTitles))
+            for title, pos, size in zip(winTitles, winPos, winSizes):
+                result.append([pID, title, pos, size])
+        # Replacing all entries, so apps which are not running anymore are also removed
+        _procNames.clear()
+        _procNames.update(procNames)
     return result
 
 
@@ -491,17 +631,17 @@ class MacOSWindow(BaseWindow):
 
         self._app = app
         self._appPID: int = app.processIdentifier()
-        self._appName: str = self.getProcName(self._appPID)
-        if not self._appName:
+        appKey = _getAppKey(app)
+        self._appName: str = _procNames.get(appKey, "") or self.getProcName(self._appPID)
+        if self._appName:
+            _procNames[appKey] = self._appName
+        else:
             # localizedName() is not recognized in AppleScript for non-English languages
             self._appName = app.localizedName()
         self._initTitle: str = title
         self._winTitle: str = title
         # self._parent = self.getParent()  # It is slow and not required by now
-        v = platform.mac_ver()[0].split(".")
-        ver = float(v[0]+"."+v[1])
-        # On Yosemite and below we need to use Zoom instead of FullScreen to maximize windows
-        self._use_zoom = (ver <= 10.10)
+        self._use_zoom = _USE_ZOOM
         self._tt: Optional[_SendTop] = None
         self._kill_tt = threading.Event()
         self._tb: Optional[_SendBottom] = None
@@ -520,9 +660,7 @@ class MacOSWindow(BaseWindow):
                     end try
                     return procName
                 end run"""
-        proc = subprocess.Popen(['osascript', '-', str(appPID)],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, str(appPID))
         return str(ret.replace("\n", ""))
 
     def getExtraFrameSize(self, includeBorder: bool = True) -> Tuple[int, int, int, int]:
@@ -614,9 +752,8 @@ class MacOSWindow(BaseWindow):
                         end tell
                     end try
                 end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        self._clearCache()
         if force and self.isAlive:
             self._app.terminate()
         return not self.isAlive
@@ -640,14 +777,9 @@ class MacOSWindow(BaseWindow):
                         end tell
                     end try
                 end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and not self.isMinimized:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-        return self.isMinimized
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        self._clearCache()
+        return _waitFor(lambda: self.isMinimized, wait)
 
     def maximize(self, wait: bool = False) -> bool:
         """
@@ -681,14 +813,10 @@ class MacOSWindow(BaseWindow):
                                 end tell
                             end try
                         end run"""
-            proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-            ret, err = proc.communicate(cmd)
-            retries = 0
-            while wait and retries < WAIT_ATTEMPTS and not self.isMaximized:
-                retries += 1
-                time.sleep(WAIT_DELAY * retries)
-        return self.isMaximized
+            ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+            self._clearCache()
+            return _waitFor(lambda: self.isMaximized, wait)
+        return True
 
     def restore(self, wait: bool = False, user: bool = False) -> bool:
         """
@@ -701,7 +829,8 @@ class MacOSWindow(BaseWindow):
         if not self._winTitle:
            return False
 
-        if self.isMaximized:
+        isMinimized, isMaximized = self._getMinMaxState()
+        if isMaximized:
             if self._use_zoom:
                 cmd = """on run {arg1, arg2}
                         set appName to arg1 as string
@@ -712,9 +841,7 @@ class MacOSWindow(BaseWindow):
                                 end tell
                             end try
                         end run"""
-                proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                ret, err = proc.communicate(cmd)
+                ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
             else:
                 cmd = """on run {arg1, arg2}
                             set appName to arg1 as string
@@ -725,10 +852,8 @@ class MacOSWindow(BaseWindow):
                                 end tell
                             end try
                         end run"""
-                proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                ret, err = proc.communicate(cmd)
-        elif self.isMinimized:
+                ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        elif isMinimized:
             cmd = """on run {arg1, arg2}
                         set appName to arg1 as string
                         set winName to arg2 as string
@@ -738,14 +863,9 @@ class MacOSWindow(BaseWindow):
                             end tell
                         end try
                     end run"""
-            proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-            ret, err = proc.communicate(cmd)
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and (self.isMinimized or self.isMaximized):
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-        return not self.isMaximized and not self.isMinimized
+            ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        self._clearCache()
+        return _waitFor(lambda: not any(self._getMinMaxState()), wait)
 
     def show(self, wait: bool = False) -> bool:
         """
@@ -770,17 +890,12 @@ class MacOSWindow(BaseWindow):
                     end try
                     return (isDone as string)
                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         ret = ret.replace("\n", "")
         if ret != "true":
             self._app.unhide()
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and not self.visible:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-        return self.visible and self.isActive
+        self._clearCache()
+        return _waitFor(lambda: self.visible, wait) and self.isActive
 
     def hide(self, wait: bool = False) -> bool:
         """
@@ -805,17 +920,12 @@ class MacOSWindow(BaseWindow):
                     end try
                     return (isDone as string)
                 end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         ret = ret.replace("\n", "")
         if ret != "true":
             self._app.hide()
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and self.visible:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-        return not self.visible
+        self._clearCache()
+        return _waitFor(lambda: not self.visible, wait)
 
     def activate(self, wait: bool = False, user: bool = True) -> bool:
         """
@@ -830,9 +940,9 @@ class MacOSWindow(BaseWindow):
 
         if not self.isVisible:
             self.show(wait=wait)
-        if self.isMinimized or self.isMaximized:
+        if any(self._getMinMaxState()):
             self.restore(wait=wait)
-        self._app.activateWithOptions_(Quartz.NSApplicationActivateIgnoringOtherApps)
+        self._app.activateWithOptions_(AppKit.NSApplicationActivateIgnoringOtherApps)
         cmd = """on run {arg1, arg2}
                     set appName to arg1 as string
                     set winName to arg2 as string
@@ -844,14 +954,8 @@ class MacOSWindow(BaseWindow):
                         end tell
                     end try
                 end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and not self.isActive:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-        return self.isActive
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        return _waitFor(lambda: self.isActive, wait)
 
     def resize(self, widthOffset: int, heightOffset: int, wait: bool = False) -> bool:
         """
@@ -860,6 +964,9 @@ class MacOSWindow(BaseWindow):
         :param wait: set to ''True'' to wait until action is confirmed (in a reasonable time lap)
         :return: ''True'' if window resized to the given size
         """
+        if not widthOffset and not heightOffset:
+            # Nothing to do. Skip querying the box, since it requires running an AppleScript
+            return bool(self._winTitle)
         box = self.box
         return self.resizeTo(box.width + widthOffset, box.height + heightOffset, wait)
 
@@ -875,13 +982,8 @@ class MacOSWindow(BaseWindow):
         if not self._winTitle:
             return False
         self.size = Size(newWidth, newHeight)
-        box = self.box
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and box.width != newWidth and box.height != newHeight:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-            box = self.box
-        return box.width == newWidth and box.height == newHeight
+        # Both width and height must match (a single box query retrieves both)
+        return _waitFor(lambda: self.size == (newWidth, newHeight), wait)
 
     def move(self, xOffset: int, yOffset: int, wait: bool = False) -> bool:
         """
@@ -892,6 +994,9 @@ class MacOSWindow(BaseWindow):
         :param wait: set to ''True'' to wait until action is confirmed (in a reasonable time lap)
         :return: ''True'' if window moved to the given position
         """
+        if not xOffset and not yOffset:
+            # Nothing to do. Skip querying the box, since it requires running an AppleScript
+            return bool(self._winTitle)
         box = self.box
         return self.moveTo(box.left + xOffset, box.top + yOffset, wait)
 
@@ -909,13 +1014,8 @@ class MacOSWindow(BaseWindow):
         if not self._winTitle:
             return False
         self.topleft = Point(newLeft, newTop)
-        box = self.box
-        retries = 0
-        while wait and retries < WAIT_ATTEMPTS and box.left != newLeft and box.top != newTop:
-            retries += 1
-            time.sleep(WAIT_DELAY * retries)
-            box = self.box
-        return self.left == newLeft and self.top == newTop
+        # Both left and top must match (a single box query retrieves both)
+        return _waitFor(lambda: self.topleft == (newLeft, newTop), wait)
 
     def alwaysOnTop(self, aot: bool = True) -> bool:
         """
@@ -977,20 +1077,18 @@ class MacOSWindow(BaseWindow):
                             set frontAppName to name of first application process whose frontmost is true
                         end tell
                         repeat with procName in procList
-                            if procName is not equal to appName then
+                            if procName is not equal to appName and procName is not equal to frontAppName then
                                 try
                                     activate application procName
-                                    if frontAppName is not equal to appName then
-                                        activate application frontAppName
-                                    end if
                                 end try
                             end if
                         end repeat
+                        if frontAppName is not equal to appName then
+                            activate application frontAppName
+                        end if
                     end try
                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         return not err
 
     def raiseWindow(self):
@@ -1014,9 +1112,7 @@ class MacOSWindow(BaseWindow):
                         end tell
                     end try
                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         return not err
 
     def sendBehind(self, sb: bool = True) -> bool:
@@ -1070,9 +1166,7 @@ class MacOSWindow(BaseWindow):
                     end try
                     return {parentRole, parentName}
                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         ret = ret.replace("\n", "")
         entries = ret.replace("\n", "").split(", ")
         role = entries[0]
@@ -1116,9 +1210,7 @@ class MacOSWindow(BaseWindow):
                     end try
                     return winChildren
                end run"""
-        proc = subprocess.Popen(['osascript', '-s', 's', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle, structured=True)
         ret = ret.replace("\n", "").replace("{", "['").replace("}", "']").replace('"', '').replace(", ", "', '").replace('missing value', '"missing value"')
         ret = ast.literal_eval(ret)
         for item in ret:
@@ -1144,15 +1236,18 @@ class MacOSWindow(BaseWindow):
 
         :return: application PID or None if it couldn't be retrieved
         """
-        cmd = """osascript -s 's' -e 'tell application "System Events"
-                                        set appPID to "0"
-                                        try
-                                            set appPID to unix id of first application process whose name is "%s"
-                                        end try
-                                    end tell
-                                    return appPID'""" % self._appName
-        ret = subprocess.check_output(cmd, shell=True).decode(encoding="utf-8").replace("\n", "") \
-            .replace('missing value', "0")
+        cmd = """on run arg1
+                    set appName to arg1 as string
+                    set appPID to "0"
+                    try
+                        tell application "System Events"
+                            set appPID to unix id of first application process whose name is appName
+                        end tell
+                    end try
+                    return appPID
+                end run"""
+        ret, err = _runAppleScript(cmd, self._appName)
+        ret = ret.replace("\n", "").replace('missing value', "0")
         if ret and ret != "0":
             return int(ret)
         return None
@@ -1201,25 +1296,7 @@ class MacOSWindow(BaseWindow):
 
         :return: ``True`` if the window is minimized
         """
-        if not self._winTitle:
-            return False
-
-        cmd = """on run {arg1, arg2}
-                    set appName to arg1 as string
-                    set winName to arg2 as string
-                    set isMin to false
-                    try
-                        tell application "System Events" to tell application process appName
-                            set isMin to value of attribute "AXMinimized" of window winName
-                        end tell
-                    end try
-                    return (isMin as string)
-                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
-        ret = ret.replace("\n", "")
-        return ret == "true"
+        return self._getMinMaxState()[0]
 
     @property
     def isMaximized(self) -> bool:
@@ -1228,38 +1305,7 @@ class MacOSWindow(BaseWindow):
 
         :return: ``True`` if the window is maximized
         """
-        if not self._winTitle:
-            return False
-
-        if self._use_zoom:
-            cmd = """on run {arg1, arg2}
-                        set appName to arg1 as string
-                        set winName to arg2 as string
-                        set isZoomed to false
-                        try
-                            tell application "System Events" to tell application appName
-                                set isZoomed to zoomed of window winName
-                            end tell
-                        end try
-                        return (isZoomed as text)
-                    end run"""
-        else:
-            cmd = """on run {arg1, arg2}
-                        set appName to arg1 as string
-                        set winName to arg2 as string
-                        set isFull to false
-                        try
-                            tell application "System Events" to tell application process appName
-                                set isFull to value of attribute "AXFullScreen" of window winName
-                            end tell
-                        end try
-                        return (isFull as string)
-                    end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
-        ret = ret.replace("\n", "")
-        return ret == "true"
+        return self._getMinMaxState()[1]
 
     @property
     def isActive(self) -> bool:
@@ -1268,8 +1314,31 @@ class MacOSWindow(BaseWindow):
 
         :return: ``True`` if the window is the active, foreground window
         """
-        active = getActiveWindow()
-        return active is not None and active._app == self._app and active.title == self._winTitle
+        if not self._winTitle:
+            return False
+
+        # Checking it directly, instead of building a new window object for the active one as getActiveWindow() does
+        cmd = """on run {arg1, arg2}
+                    set pid to arg1 as integer
+                    set winName to arg2 as string
+                    set isActive to false
+                    try
+                        tell application "System Events"
+                            set proc to first application process whose unix id is pid
+                            if frontmost of proc then
+                                tell proc
+                                    considering case
+                                        set isActive to (value of attribute "AXTitle" of (1st window whose value of attribute "AXMain" is true)) is winName
+                                    end considering
+                                end tell
+                            end if
+                        end tell
+                    end try
+                    return (isActive as string)
+                end run"""
+        ret, err = _runAppleScript(cmd, str(self._appPID), self._winTitle)
+        ret = ret.replace("\n", "")
+        return ret == "true"
 
     @property
     def title(self) -> str:
@@ -1281,8 +1350,7 @@ class MacOSWindow(BaseWindow):
 
         :return: title as a string or None
         """
-        titles = _getAppWindowsTitles(self._app)
-        if self._winTitle and self._winTitle not in titles:
+        if self._winTitle and not self._isTitleFound():
             self._winTitle = ""
         return self._winTitle
 
@@ -1301,7 +1369,7 @@ class MacOSWindow(BaseWindow):
 
         :return: possible new title, empty if no similar title found or same title if it didn't change, as a string
         """
-        titles = _getAppWindowsTitles(self._app)
+        titles = _getAppWindowsTitles(self._app, useCache=False)
         if self._initTitle not in titles:
             newTitles = difflib.get_close_matches(self._initTitle, titles, n=1)  # cutoff=0.6 is the default value
             if newTitles:
@@ -1318,7 +1386,7 @@ class MacOSWindow(BaseWindow):
 
         :return: ``True`` if the window is currently visible
         """
-        return bool(self._winTitle and self._winTitle in _getAppWindowsTitles(self._app))
+        return bool(self._winTitle and self._isTitleFound())
 
     isVisible: bool = cast(bool, visible)  # isVisible is an alias for the visible property.
 
@@ -1344,12 +1412,73 @@ class MacOSWindow(BaseWindow):
                     end try
                     return (isDone as string)
                end run"""
-        proc = subprocess.Popen(['osascript', '-', self._appName, self._winTitle],
-                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-        ret, err = proc.communicate(cmd)
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
         ret = ret.replace("\n", "")
         return ret == "true"
 
+    def _isTitleFound(self) -> bool:
+        # Cached titles may be older than the window, so they are not enough to tell the window is gone
+        return self._winTitle in _getAppWindowsTitles(self._app) or \
+            self._winTitle in _getAppWindowsTitles(self._app, useCache=False)
+
+    def _getMinMaxState(self) -> Tuple[bool, bool]:
+        # Returns both minimized and maximized status in just one AppleScript call
+        if not self._winTitle:
+            return False, False
+
+        # Status is reused for a very short time, since it is often queried several times in a row (e.g. by restore())
+        key = (self._appPID, self._winTitle)
+        cached = _winStates.get(key, None)
+        if cached is not None and time.monotonic() - cached[0] < _WIN_STATES_TTL:
+            return cached[1]
+
+        if self._use_zoom:
+            cmd = """on run {arg1, arg2}
+                        set appName to arg1 as string
+                        set winName to arg2 as string
+                        set isMin to false
+                        set isZoomed to false
+                        try
+                            tell application "System Events" to tell application process appName
+                                set isMin to value of attribute "AXMinimized" of window winName
+                            end tell
+                        end try
+                        try
+                            tell application "System Events" to tell application appName
+                                set isZoomed to zoomed of window winName
+                            end tell
+                        end try
+                        return {isMin, isZoomed}
+                    end run"""
+        else:
+            cmd = """on run {arg1, arg2}
+                        set appName to arg1 as string
+                        set winName to arg2 as string
+                        set isMin to false
+                        set isFull to false
+                        try
+                            tell application "System Events" to tell application process appName
+                                set isMin to value of attribute "AXMinimized" of window winName
+                            end tell
+                        end try
+                        try
+                            tell application "System Events" to tell application process appName
+                                set isFull to value of attribute "AXFullScreen" of window winName
+                            end tell
+                        end try
+                        return {isMin, isFull}
+                    end run"""
+        ret, err = _runAppleScript(cmd, self._appName, self._winTitle)
+        entries = ret.replace("\n", "").split(", ")
+        state = (entries[0] == "true", len(entries) > 1 and entries[1] == "true")
+        _winStates[key] = (time.monotonic(), state)
+        return state
+
+    def _clearCache(self):
+        # Cached titles and status are not valid anymore after any action on the window
+        _appTitles.pop(self._appPID, None)
+        _winStates.pop((self._appPID, self._winTitle), None)
+
     # @property
     # def isAlerting(self) -> bool:
     #     """
@@ -1418,9 +1547,7 @@ class MacOSWindow(BaseWindow):
 
             def findit():
 
-                level = 0
-
-                while True:
+                def getLevel(level: int) -> Optional[List[Any]]:
                     part = ""
                     for lev in range(level):
                         if lev % 2 == 0:
@@ -1435,53 +1562,60 @@ class MacOSWindow(BaseWindow):
                     else:
                         subCmd4 = "set attrList to {}"
 
-                    if level % 2 == 0:  # Grabbing items only (menus will have non-empty lists on the next level)
-
-                        cmd = """on run arg1
-                                    set procName to arg1 as string
-                                    set nameList to {}
-                                    set sizeList to {}
-                                    set posList to {}
-                                    set attrList to {}
-                                    try
-                                        tell application "System Events"
-                                            tell process procName
-                                                tell menu bar 1
-                                                    %s
-                                                    %s
-                                                    %s
-                                                    %s
-                                                end tell
+                    cmd = """on run arg1
+                                set procName to arg1 as string
+                                set nameList to {}
+                                set sizeList to {}
+                                set posList to {}
+                                set attrList to {}
+                                try
+                                    tell application "System Events"
+                                        tell process procName
+                                            tell menu bar 1
+                                                %s
+                                                %s
+                                                %s
+                                                %s
                                             end tell
                                         end tell
-                                    end try
-                                    return {nameList, sizeList, posList, attrList}
-                                end run
-                                """ % (subCmd1, subCmd2, subCmd3, subCmd4)
-                        # https://stackoverflow.com/questions/69774133/how-to-use-global-variables-inside-of-an-applescript-function-for-a-python-code
-                        # Didn't find a way to get the "injected code" working if passed this way
-                        proc = subprocess.Popen(['osascript', '-s', 's', '-', str(self._parent._app.localizedName())],
-                                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                        ret, err = proc.communicate(cmd)
-                        if addItemInfo:
-                            ret = ret.replace("\n", "").replace("\t", "").replace('missing value', '"missing value"') \
-                                .replace("{", "[").replace("}", "]").replace("value:", "'") \
-                                .replace(", class:", "', '").replace(", settable:", "', '").replace(", name:", "', ")
-                        else:
-                            ret = ret.replace("\n", "").replace("\t", "").replace('missing value', '"missing value"') \
-                                .replace("{", "[").replace("}", "]")
-                        item = ast.literal_eval(ret)
-
-                        if err is None and not self._isListEmpty(item[0]):
-                            nameList.append(item[0])
-                            sizeList.append(item[1])
-                            posList.append(item[2])
-                            attrList.append(item[3])
-                        else:
-                            break
-                    level += 1
-
-                return nameList
+                                    end tell
+                                end try
+                                return {nameList, sizeList, posList, attrList}
+                            end run
+                            """ % (subCmd1, subCmd2, subCmd3, subCmd4)
+                    # https://stackoverflow.com/questions/69774133/how-to-use-global-variables-inside-of-an-applescript-function-for-a-python-code
+                    # Didn't find a way to get the "injected code" working if passed this way
+                    ret, err = _runAppleScript(cmd, self._parent._appName, structured=True, cache=False)
+                    if addItemInfo:
+                        ret = ret.replace("\n", "").replace("\t", "").replace('missing value', '"missing value"') \
+                            .replace("{", "[").replace("}", "]").replace("value:", "'") \
+                            .replace(", class:", "', '").replace(", settable:", "', '").replace(", name:", "', ")
+                    else:
+                        ret = ret.replace("\n", "").replace("\t", "").replace('missing value', '"missing value"') \
+                            .replace("{", "[").replace("}", "]")
+                    item = ast.literal_eval(ret)
+
+                    if err is None and not self._isListEmpty(item[0]):
+                        return item
+                    return None
+
+                # Grabbing items only (menus will have non-empty lists on the next level), so odd levels are skipped
+                # Levels don't depend on each other, so several of them are queried at once (most menus are not
+                # deeper than a batch), stopping at the first one which is empty
+                batch = 4
+                level = 0
+                while True:
+                    levels = range(level, level + 2 * batch, 2)
+                    with ThreadPoolExecutor(max_workers=batch) as executor:
+                        items = list(executor.map(getLevel, levels))
+                    for item in items:
+                        if item is None:
+                            return nameList
+                        nameList.append(item[0])
+                        sizeList.append(item[1])
+                        posList.append(item[2])
+                        attrList.append(item[3])
+                    level += 2 * batch
 
             def fillit():
 
@@ -1581,10 +1715,10 @@ class MacOSWindow(BaseWindow):
                     part = ""
                     for i, item in enumerate(itemPath[1:-1]):
                         if i % 2 == 0:
-                            part = str(' of menu "%s" of menu item "%s"' % (item, item)) + part
+                            part = str(' of menu "%s" of menu item "%s"' % (_escapeAppleScript(item), _escapeAppleScript(item))) + part
                         else:
-                            part = str(' of menu item "%s" of menu "%s"' % (item, item)) + part
-                    subCmd = str('click menu item "%s"' % itemPath[-1]) + part + str(' of menu "%s" of menu bar item "%s"' % (itemPath[0], itemPath[0]))
+                            part = str(' of menu item "%s" of menu "%s"' % (_escapeAppleScript(item), _escapeAppleScript(item))) + part
+                    subCmd = str('click menu item "%s"' % _escapeAppleScript(itemPath[-1])) + part + str(' of menu "%s" of menu bar item "%s"' % (_escapeAppleScript(itemPath[0]), _escapeAppleScript(itemPath[0])))
 
                     cmd = """on run arg1
                                 set procName to arg1 as string
@@ -1600,9 +1734,7 @@ class MacOSWindow(BaseWindow):
                             end run
                             """ % subCmd
 
-                    proc = subprocess.Popen(['osascript', '-s', 's', '-', str(self._parent._app.localizedName())], 
-                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                    ret, err = proc.communicate(cmd)
+                    ret, err = _runAppleScript(cmd, self._parent._appName, structured=True, cache=False)
 
             return found
 
@@ -1642,10 +1774,10 @@ class MacOSWindow(BaseWindow):
                     part = ""
                     for i, item in enumerate(menuPath[:-1]):
                         if i % 2 == 0:
-                            part = str(' of menu "%s"' % item) + part
+                            part = str(' of menu "%s"' % _escapeAppleScript(item)) + part
                         else:
-                            part = str(' of menu item "%s"' % item) + part
-                    subCmd = 'set itemCount to count of every menu item' + part + str(' of menu bar item "%s"' % menuPath[0])
+                            part = str(' of menu item "%s"' % _escapeAppleScript(item)) + part
+                    subCmd = 'set itemCount to count of every menu item' + part + str(' of menu bar item "%s"' % _escapeAppleScript(menuPath[0]))
 
                     cmd = """on run arg1
                                 set procName to arg1 as string
@@ -1663,9 +1795,7 @@ class MacOSWindow(BaseWindow):
                             end run
                             """ % subCmd
 
-                    proc = subprocess.Popen(['osascript', '-s', 's', '-', str(self._parent._app.localizedName())], 
-                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                    ret, err = proc.communicate(cmd)
+                    ret, err = _runAppleScript(cmd, self._parent._appName, structured=True, cache=False)
                     ret = ret.replace("\n", "")
                     if ret.isnumeric():
                         count = int(ret)
@@ -1703,10 +1833,10 @@ class MacOSWindow(BaseWindow):
                     part = ""
                     for lev, item in enumerate(itemPath[:-1]):
                         if lev % 2 == 0:
-                            part = str(' of menu "%s"' % item) + part
+                            part = str(' of menu "%s"' % _escapeAppleScript(item)) + part
                         else:
-                            part = str(' of menu item "%s"' % item) + part
-                    subCmd = str('set attrList to properties of every attribute of menu item "%s"' % itemPath[-1]) + part + str(' of menu bar item "%s"' % itemPath[0])
+                            part = str(' of menu item "%s"' % _escapeAppleScript(item)) + part
+                    subCmd = str('set attrList to properties of every attribute of menu item "%s"' % _escapeAppleScript(itemPath[-1])) + part + str(' of menu bar item "%s"' % _escapeAppleScript(itemPath[0]))
                     # subCmd2 = str('set propList to properties of menu item "%s"' % itemPath[-1]) + part + str(' of menu bar item "%s"' % itemPath[0])
 
                     cmd = """on run arg1
@@ -1724,9 +1854,7 @@ class MacOSWindow(BaseWindow):
                             """ % subCmd
                     # https://stackoverflow.com/questions/69774133/how-to-use-global-variables-inside-of-an-applescript-function-for-a-python-code
                     # Didn't find a way to get the "injected code" working if passed this way
-                    proc = subprocess.Popen(['osascript', '-s', 's', '-', str(self._parent._app.localizedName())], 
-                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                    ret, err = proc.communicate(cmd)
+                    ret, err = _runAppleScript(cmd, self._parent._appName, structured=True, cache=False)
                     itemInfo = self._parseAttr(ret)
 
             return itemInfo
@@ -1748,10 +1876,10 @@ class MacOSWindow(BaseWindow):
                     part = ""
                     for i, item in enumerate(itemPath[1:-1]):
                         if i % 2 == 0:
-                            part = str(' of menu "%s" of menu item "%s"' % (item, item)) + part
+                            part = str(' of menu "%s" of menu item "%s"' % (_escapeAppleScript(item), _escapeAppleScript(item))) + part
                         else:
-                            part = str(' of menu item "%s" of menu "%s"' % (item, item)) + part
-                    subCmd = str('set itemRect to {position, size} of menu item "%s"' % itemPath[-1]) + part + str(' of menu "%s" of menu bar item "%s"' % (itemPath[0], itemPath[0]))
+                            part = str(' of menu item "%s" of menu "%s"' % (_escapeAppleScript(item), _escapeAppleScript(item))) + part
+                    subCmd = str('set itemRect to {position, size} of menu item "%s"' % _escapeAppleScript(itemPath[-1])) + part + str(' of menu "%s" of menu bar item "%s"' % (_escapeAppleScript(itemPath[0]), _escapeAppleScript(itemPath[0])))
 
                     cmd = """on run arg1
                                 set procName to arg1 as string
@@ -1769,9 +1897,7 @@ class MacOSWindow(BaseWindow):
                             end run
                             """ % subCmd
 
-                    proc = subprocess.Popen(['osascript', '-s', 's', '-', str(self._parent._app.localizedName())], 
-                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, encoding='utf8')
-                    ret, err = proc.communicate(cmd)
+                    ret, err = _runAppleScript(cmd, self._parent._appName, structured=True, cache=False)
                     ret = ret.replace("\n", "").replace("{", "[").replace("}", "]").replace('missing value', '"missing value"')
                     rect = ast.literal_eval(ret)
                     x, y = rect[0]
@@ -2130,7 +2256,7 @@ class _SendBottom(threading.Thread):
 #         self.size = Size(newWidth, newHeight)
 #         box = self.box
 #         retries = 0
-#         while wait and retries < WAIT_ATTEMPTS and box.width != newWidth and box.height != newHeight:
+#         while wait and retries < WAIT_ATTEMPTS and (box.width != newWidth or box.height != newHeight):
 #             retries += 1
 #             time.sleep(WAIT_DELAY * retries)
 #             box = self.box
@@ -2162,7 +2288,7 @@ class _SendBottom(threading.Thread):
 #         self.topleft = Point(newLeft, newTop)
 #         box = self.box
 #         retries = 0
-#         while wait and retries < WAIT_ATTEMPTS and box.left != newLeft and box.top != newTop:
+#         while wait and retries < WAIT_ATTEMPTS and (box.left != newLeft or box.top != newTop):
 #             retries += 1
 #             time.sleep(WAIT_DELAY * retries)
 #             box = self.box
@@ -276,7 +276,7 @@ def getAllWindowsDict(tryToFilter: bool = False) -> dict[str, _WINDICT]:
                     "size": (size.width, size.height),
                     "status": status
                 }
-                if appName not in result.keys():
+                if appName not in result:
                     result[appName] = {"pid": appPID, "windows": {}}
                 result[appName]["windows"][win.title] = winDict
                 break
@@ -670,6 +670,10 @@ class Win32Window(BaseWindow):
         :param wait: set to ''True'' to wait until action is confirmed (in a reasonable time lap)
         :return: ''True'' if window resized to the given size
         """
+        box = self.box
+        if box.width == newWidth and box.height == newHeight:
+            # Nothing to do. Reading the box is cheap, whilst resizing and waiting for it to complete is not
+            return True
         self.size = Size(newWidth, newHeight)
         box = self.box
         retries = 0
@@ -704,6 +708,10 @@ class Win32Window(BaseWindow):
         :param wait: set to ''True'' to wait until action is confirmed (in a reasonable time lap)
         :return: ''True'' if window moved to the given position
         """
+        box = self.box
+        if box.left == newLeft and box.top == newTop:
+            # Nothing to do. Reading the box is cheap, whilst moving and waiting for it to complete is not
+            return True
         self.topleft = Point(newLeft, newTop)
         box = self.box
         retries = 0